@@ -0,0 +1,63 @@
+import argparse
+import os
+import sys
+import sysconfig
+import time
+from xldparser.bulk import BULK_EXECUTOR_PROCESS, BULK_EXECUTOR_THREAD, parse_file, parse_files
+from xldparser.pipeline import XLDReadAhead
+
+def collect(roots: list[str]):
+    paths: list[str] = []
+    for root in roots:
+        if os.path.isfile(root):
+            paths.append(root)
+            continue
+        for dirpath, _, filenames in os.walk(root):
+            paths.extend(os.path.join(dirpath, f) for f in filenames if f.endswith(".log"))
+    return paths
+
+
+def report(name: str, count: int, elapsed: float):
+    print("%-10s %8d logs %8.3fs %10.1f logs/s" % (name, count, elapsed, count / elapsed))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare serial, thread-pool, process-pool and read-ahead parsing throughput")
+    parser.add_argument("roots", nargs="+", help="XLD log files or directories containing them")
+    parser.add_argument("--repeat", type=int, default=1, help="parse every file this many times")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--io-workers", type=int, default=4, help="I/O threads for the read-ahead pipeline")
+    args = parser.parse_args()
+
+    paths = collect(args.roots) * args.repeat
+    gil_enabled = sys._is_gil_enabled() if hasattr(sys, "_is_gil_enabled") else True
+    print("Python %s, free-threaded build: %s, GIL enabled: %s, workers: %d" % (
+        sys.version.split()[0],
+        bool(sysconfig.get_config_var("Py_GIL_DISABLED")),
+        gil_enabled,
+        args.workers
+    ))
+
+    start = time.perf_counter()
+    errors = sum(1 for path in paths if parse_file(path).error is not None)
+    report("serial", len(paths), time.perf_counter() - start)
+    for executor in (BULK_EXECUTOR_THREAD, BULK_EXECUTOR_PROCESS):
+        start = time.perf_counter()
+        assert sum(1 for r in parse_files(paths, executor=executor, max_workers=args.workers) if r.error is not None) == errors
+        report(executor, len(paths), time.perf_counter() - start)
+    read_ahead = XLDReadAhead(io_workers=args.io_workers)
+    start = time.perf_counter()
+    assert sum(1 for r in read_ahead.parse(paths) if r.error is not None) == errors
+    report("readahead", len(paths), time.perf_counter() - start)
+    print("readahead: mean queue depth %.1f, max %d, I/O stall %.3fs, parse stall %.3fs" % (
+        read_ahead.stats.mean_queue_depth() or 0,
+        read_ahead.stats.max_queue_depth,
+        read_ahead.stats.io_stall_seconds,
+        read_ahead.stats.parse_stall_seconds
+    ))
+    if errors > 0:
+        print("%d logs failed to parse" % (errors,))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,9 @@
 from dataclasses import dataclass
 from datetime import datetime
-from io import TextIOBase
+from io import BytesIO, TextIOBase, TextIOWrapper
 from . import constants as c
+from .filter import XLDFieldPredicate, XLDLogFilter, XLDLogFilterRun, XLDTrackPredicate
+from .index import XLDIndexedLog, XLDLogIndex
 from .second_sector import SecondSectorInt
 from .toc_entry import XLDTOCEntry
 from .track import XLDTrackEntry, XLDTrackEntryCancelled, XLDTrackStatistics
@@ -158,6 +160,17 @@ class XLDLog:
 
     @staticmethod
     def parse(input: TextIOBase):
+        log = XLDLog._parse(input, None)
+        assert log is not None
+        return log
+
+    @staticmethod
+    def parse_filtered(input: TextIOBase, log_filter: XLDLogFilter):
+        # returns None as soon as the log can no longer match, without reading the rest of input
+        return XLDLog._parse(input, log_filter.start())
+
+    @staticmethod
+    def _parse(input: TextIOBase, filter_run: XLDLogFilterRun | None):
         cancelled = False
 
         xld_version = input.readline().rstrip()
@@ -216,6 +229,21 @@ class XLDLog:
 
         assert input.readline().rstrip() == ""
 
+        if filter_run is not None and not filter_run.feed(
+            xld_version=xld_version,
+            log_start_time=log_start_time,
+            used_drive=used_drive,
+            media_type=media_type,
+            artist_and_album_title=artist_and_album_title,
+            ripper_mode=ripper_mode,
+            disable_audio_cache=disable_audio_cache,
+            make_use_of_c2_pointers=make_use_of_c2_pointers,
+            read_offset_correction=read_offset_correction,
+            max_retry_count=max_retry_count,
+            gap_status=gap_status,
+        ):
+            return None
+
         assert input.readline().rstrip() == c.XLD_TOC_HEADER
         assert input.readline().rstrip("\n") == c.XLD_TOC_HEADER_TITLE
         assert input.readline().rstrip() == c.XLD_TOC_HEADER_SEPARATOR
@@ -226,6 +254,8 @@ class XLDLog:
             if line == "":
                 break
             toc.append(XLDTOCEntry.parse(line))
+        if filter_run is not None and not filter_run.feed(toc=toc):
+            return None
 
         alternate_offset_corrections: list[XLDAlternateOffsetCorrectionEntry] = []
         while True:
@@ -242,6 +272,8 @@ class XLDLog:
                     i += 1
                 continue
             break
+        if filter_run is not None and not filter_run.feed(alternate_offset_corrections=alternate_offset_corrections):
+            return None
 
         accuraterip_summary: list[XLDAccurateRipSummaryEntryWithNo] = []
         if accuraterip_summary_header == c.XLD_ACCURATERIP_SUMMARY_DISC_NOTFOUND_HEADER:
@@ -278,12 +310,16 @@ class XLDLog:
                     break
                 else:
                     raise Exception("Unknown line: " + line)
+        if filter_run is not None and not filter_run.feed(accuraterip_disc_id=accuraterip_disc_id, accuraterip_summary=accuraterip_summary, is_cancelled=cancelled):
+            return None
         if not cancelled:
             assert input.readline().rstrip() == c.XLD_ALL_TRACKS_HEADER
             all_tracks_summary = XLDTrackStatistics.parse(input)
             assert input.readline().rstrip() == ""
         else:
             all_tracks_summary = None
+        if filter_run is not None and not filter_run.feed(all_tracks_summary=all_tracks_summary):
+            return None
 
         tracks: list[XLDTrackEntry | XLDTrackEntryCancelled] = []
         successfly_ripped = False
@@ -300,7 +336,11 @@ class XLDLog:
             track_entry = XLDTrackEntry.parse(line, input)
             if isinstance(track_entry, XLDTrackEntryCancelled):
                 assert cancelled
+            elif filter_run is not None and not filter_run.feed_track(track_entry):
+                return None
             tracks.append(track_entry)
+        if filter_run is not None and not filter_run.finish(tracks=tracks, successfly_ripped=successfly_ripped):
+            return None
 
         return XLDLog(
             xld_version=xld_version,
@@ -324,6 +364,14 @@ class XLDLog:
             is_cancelled=cancelled
         )
 
+    @staticmethod
+    def parse_bytes(data: bytes):
+        return XLDLog.parse(TextIOWrapper(BytesIO(data), encoding="utf-8"))
+
+    @staticmethod
+    def open_indexed(path: str, index_path: str | None = None):
+        return XLDIndexedLog.open(path, index_path)
+
     def as_log(self, dest: TextIOBase):
         dest.write(c.XLD_VERSION_PREFIX + self.xld_version + "\n\n")
         dest.write(c.XLD_LOG_START_TIME_PREFIX + self.log_start_time.strftime(c.XLD_LOG_START_TIME_FORMAT) + "\n\n")
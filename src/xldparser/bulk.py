@@ -0,0 +1,66 @@
+import os
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from itertools import islice
+from typing import Iterable, Iterator
+from . import XLDLog, XLDLogFilter
+
+# XLDLog.parse keeps no state outside its own stack frame and only reads the module-level
+# compiled patterns, so logs can be parsed from many threads at once. On free-threaded
+# builds the thread pool runs truly in parallel and avoids pickling results between processes.
+BULK_EXECUTOR_THREAD = "thread"
+BULK_EXECUTOR_PROCESS = "process"
+# tasks in flight per worker; finished logs beyond this window are not held waiting for the consumer
+BULK_WINDOW_PER_WORKER = 4
+
+@dataclass
+class XLDParseResult:
+    path: str
+    log: XLDLog | None
+    error: str | None
+
+
+def parse_file(path: str, log_filter: XLDLogFilter | None = None):
+    # with a filter, a rejected log gives a result with neither log nor error
+    try:
+        with open(path, encoding="utf-8") as f:
+            if log_filter is not None:
+                return XLDParseResult(path=path, log=XLDLog.parse_filtered(f, log_filter), error=None)
+            return XLDParseResult(path=path, log=XLDLog.parse(f), error=None)
+    except Exception as e:
+        return XLDParseResult(path=path, log=None, error=repr(e))
+
+
+def _parse_chunk(paths: list[str], log_filter: XLDLogFilter | None):
+    return [parse_file(path, log_filter) for path in paths]
+
+
+def _make_executor(executor: str, max_workers: int | None) -> Executor:
+    if executor == BULK_EXECUTOR_THREAD:
+        return ThreadPoolExecutor(max_workers=max_workers)
+    elif executor == BULK_EXECUTOR_PROCESS:
+        return ProcessPoolExecutor(max_workers=max_workers)
+    raise Exception(f"Unknown executor: {executor}")
+
+
+def parse_files(paths: Iterable[str], executor: str = BULK_EXECUTOR_THREAD, max_workers: int | None = None, chunksize: int = 16, log_filter: XLDLogFilter | None = None) -> Iterator[XLDParseResult]:
+    # results come back in input order; rejected logs are left out. With the process executor
+    # paths are sent in chunks, and the filter's predicates must be picklable.
+    if executor != BULK_EXECUTOR_PROCESS:
+        chunksize = 1
+    window = BULK_WINDOW_PER_WORKER * (max_workers or os.cpu_count() or 1)
+    paths_iter = iter(paths)
+    in_flight: deque[Future[list[XLDParseResult]]] = deque()
+    with _make_executor(executor, max_workers) as pool:
+        while True:
+            while len(in_flight) < window:
+                chunk = list(islice(paths_iter, chunksize))
+                if len(chunk) == 0:
+                    break
+                in_flight.append(pool.submit(_parse_chunk, chunk, log_filter))
+            if len(in_flight) == 0:
+                break
+            for result in in_flight.popleft().result():
+                if result.log is not None or result.error is not None:
+                    yield result
@@ -0,0 +1,68 @@
+import dataclasses
+from typing import Any, Callable
+from .track import XLDTrackEntry
+
+class XLDFieldPredicate:
+    # fields are XLDLog attribute names; fn is called with their values, in order, once all of them are parsed
+    def __init__(self, fields: str | tuple[str, ...], fn: Callable[..., bool]):
+        # imported here since the package root imports this module
+        from . import XLDLog
+        self.fields = (fields,) if isinstance(fields, str) else fields
+        known = {f.name for f in dataclasses.fields(XLDLog)}
+        unknown = [f for f in self.fields if f not in known]
+        if len(unknown) > 0:
+            raise Exception("Unknown XLDLog fields: " + ", ".join(unknown))
+        self.fn = fn
+
+class XLDTrackPredicate:
+    # matches if any track (or, with all_tracks, every track) satisfies fn; cancelled tracks are not checked
+    def __init__(self, fn: Callable[[XLDTrackEntry], bool], all_tracks: bool = False):
+        self.fn = fn
+        self.all_tracks = all_tracks
+
+class XLDLogFilter:
+    # a log matches when every predicate matches. The filter itself is never mutated, so one
+    # instance can be shared by parser threads; each parse gets its own XLDLogFilterRun.
+    def __init__(self, *predicates: XLDFieldPredicate | XLDTrackPredicate):
+        self.predicates = predicates
+
+    def start(self):
+        return XLDLogFilterRun(self)
+
+class XLDLogFilterRun:
+    def __init__(self, log_filter: XLDLogFilter):
+        self.fields: dict[str, Any] = {}
+        self.field_predicates = [p for p in log_filter.predicates if isinstance(p, XLDFieldPredicate)]
+        self.track_predicates = [p for p in log_filter.predicates if isinstance(p, XLDTrackPredicate)]
+
+    def feed(self, **fields: Any):
+        # returns False as soon as the log can no longer match
+        self.fields.update(fields)
+        pending: list[XLDFieldPredicate] = []
+        for predicate in self.field_predicates:
+            if not all(f in self.fields for f in predicate.fields):
+                pending.append(predicate)
+            elif not predicate.fn(*(self.fields[f] for f in predicate.fields)):
+                return False
+        self.field_predicates = pending
+        return True
+
+    def feed_track(self, track: XLDTrackEntry):
+        pending: list[XLDTrackPredicate] = []
+        for predicate in self.track_predicates:
+            matched = predicate.fn(track)
+            if predicate.all_tracks:
+                if not matched:
+                    return False
+                pending.append(predicate)
+            elif not matched:
+                pending.append(predicate)
+        self.track_predicates = pending
+        return True
+
+    def finish(self, **fields: Any):
+        # every XLDLog field has been fed by now, so all field predicates have been evaluated
+        if not self.feed(**fields):
+            return False
+        # the remaining "any" predicates never matched a track
+        return all(p.all_tracks for p in self.track_predicates)
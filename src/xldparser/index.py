@@ -0,0 +1,137 @@
+import json
+import os
+from dataclasses import dataclass
+from io import TextIOWrapper
+from . import constants as c
+from .track import XLDTrackEntry, XLDTrackStatistics
+
+INDEX_SUFFIX = ".xldidx"
+INDEX_VERSION = 1
+
+INDEX_SECTION_TOC = "toc"
+INDEX_SECTION_ALTERNATE_OFFSET_CORRECTIONS = "alternate_offset_corrections"
+INDEX_SECTION_ACCURATERIP_SUMMARY = "accuraterip_summary"
+INDEX_SECTION_ALL_TRACKS = "all_tracks"
+INDEX_SECTION_FOOTER = "footer"
+
+@dataclass
+class XLDLogIndex:
+    size: int
+    mtime_ns: int
+    # byte offsets of the header line of each section and each "Track NN" block
+    sections: dict[str, int]
+    tracks: dict[int, int]
+
+    @staticmethod
+    def build(path: str):
+        st = os.stat(path)
+        sections: dict[str, int] = {}
+        tracks: dict[int, int] = {}
+        offset = 0
+        with open(path, "rb") as f:
+            for raw in f:
+                line = raw.decode("utf-8").rstrip()
+                # everything above the TOC is header, and the album title line may read like a section header
+                if line == c.XLD_TOC_HEADER:
+                    sections[INDEX_SECTION_TOC] = offset
+                elif INDEX_SECTION_TOC not in sections:
+                    pass
+                elif line == c.XLD_ALTERNATE_OFFSET_CORRECTION_VALUES_LIST_TITLE:
+                    sections[INDEX_SECTION_ALTERNATE_OFFSET_CORRECTIONS] = offset
+                elif line.startswith(c.XLD_ACCURATERIP_SUMMARY_DISC_NOTFOUND_HEADER):
+                    sections[INDEX_SECTION_ACCURATERIP_SUMMARY] = offset
+                elif line == c.XLD_ALL_TRACKS_HEADER:
+                    sections[INDEX_SECTION_ALL_TRACKS] = offset
+                elif line == c.XLD_FOOTER_NO_ERROR or line == c.XLD_FOOTER_SOME_ERROR:
+                    sections[INDEX_SECTION_FOOTER] = offset
+                else:
+                    track_header = c.XLD_TRACK_HEADER.match(line)
+                    if track_header is not None:
+                        tracks[int(track_header.group(1))] = offset
+                offset += len(raw)
+        return XLDLogIndex(size=st.st_size, mtime_ns=st.st_mtime_ns, sections=sections, tracks=tracks)
+
+    @staticmethod
+    def load(index_path: str):
+        # an outdated, unreadable, truncated or corrupt sidecar gives None, so the caller rebuilds it
+        try:
+            with open(index_path, encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") != INDEX_VERSION:
+                return None
+            index = XLDLogIndex(
+                size=data["size"],
+                mtime_ns=data["mtime_ns"],
+                sections=dict(data["sections"]),
+                tracks={int(no): offset for no, offset in data["tracks"].items()}
+            )
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            return None
+        values = [index.size, index.mtime_ns, *index.sections.values(), *index.tracks.values()]
+        if not all(type(v) is int for v in values) or not all(type(k) is str for k in index.sections):
+            return None
+        return index
+
+    def save(self, index_path: str):
+        tmp_path = index_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "version": INDEX_VERSION,
+                "size": self.size,
+                "mtime_ns": self.mtime_ns,
+                "sections": self.sections,
+                "tracks": {str(no): offset for no, offset in self.tracks.items()},
+            }, f)
+        os.replace(tmp_path, index_path)
+
+    def is_fresh(self, path: str):
+        st = os.stat(path)
+        return self.size == st.st_size and self.mtime_ns == st.st_mtime_ns
+
+
+class XLDIndexedLog:
+    def __init__(self, path: str, index: XLDLogIndex):
+        self.path = path
+        self.index = index
+
+    @staticmethod
+    def open(path: str, index_path: str | None = None):
+        # the index is built on first open and rebuilt whenever the log's size or mtime changes
+        if index_path is None:
+            index_path = path + INDEX_SUFFIX
+        index = None
+        if os.path.exists(index_path):
+            index = XLDLogIndex.load(index_path)
+            if index is not None and not index.is_fresh(path):
+                index = None
+        if index is None:
+            index = XLDLogIndex.build(path)
+            try:
+                index.save(index_path)
+            except OSError:
+                # e.g. a read-only archive; the in-memory index still works for this instance
+                pass
+        return XLDIndexedLog(path, index)
+
+    def track_numbers(self):
+        return sorted(self.index.tracks.keys())
+
+    def _open_at(self, offset: int):
+        f = open(self.path, "rb")
+        f.seek(offset)
+        return TextIOWrapper(f, encoding="utf-8")
+
+    def track(self, no: int):
+        offset = self.index.tracks.get(no)
+        if offset is None:
+            raise Exception(f"Track {no} is not in {self.path}")
+        with self._open_at(offset) as input:
+            return XLDTrackEntry.parse(input.readline().rstrip(), input)
+
+    def all_tracks_summary(self):
+        offset = self.index.sections.get(INDEX_SECTION_ALL_TRACKS)
+        if offset is None:
+            return None
+        with self._open_at(offset) as input:
+            assert input.readline().rstrip() == c.XLD_ALL_TRACKS_HEADER
+            return XLDTrackStatistics.parse(input)
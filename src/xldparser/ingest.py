@@ -0,0 +1,154 @@
+import hashlib
+import os
+import sqlite3
+import time
+from dataclasses import dataclass
+from fnmatch import fnmatch
+from typing import Iterable, Iterator
+from . import XLDLog
+
+INGEST_EVENT_ADDED = "added"
+INGEST_EVENT_CHANGED = "changed"
+INGEST_EVENT_REMOVED = "removed"
+
+INGEST_STATUS_OK = "ok"
+INGEST_STATUS_ERROR = "error"
+
+_MANIFEST_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    sha256 TEXT NOT NULL,
+    status TEXT NOT NULL,
+    error TEXT
+);
+CREATE TEMP TABLE IF NOT EXISTS seen (
+    path TEXT PRIMARY KEY
+);
+"""
+
+@dataclass
+class XLDIngestEvent:
+    kind: str
+    path: str
+    log: XLDLog | None
+    error: str | None
+
+
+class XLDIngest:
+    def __init__(self, manifest_path: str, pattern: str = "*.log", checkpoint_interval: int = 500):
+        self.pattern = pattern
+        self.checkpoint_interval = checkpoint_interval
+        self._db = sqlite3.connect(manifest_path)
+        self._db.executescript(_MANIFEST_SCHEMA)
+        self._db.commit()
+
+    def close(self):
+        self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args: object):
+        self.close()
+
+    def _walk(self, roots: Iterable[str]):
+        for root in roots:
+            for dirpath, dirnames, filenames in os.walk(root):
+                dirnames.sort()
+                for filename in sorted(filenames):
+                    if fnmatch(filename, self.pattern):
+                        yield os.path.join(dirpath, filename)
+
+    def _record(self, path: str, row: tuple[int, int, str, str | None] | None, st: os.stat_result, data: bytes):
+        sha256 = hashlib.sha256(data).hexdigest()
+        if row is not None and row[2] == sha256:
+            self._db.execute("UPDATE files SET size = ?, mtime_ns = ? WHERE path = ?", (st.st_size, st.st_mtime_ns, path))
+            return None
+        log = None
+        error = None
+        try:
+            log = XLDLog.parse_bytes(data)
+        except Exception as e:
+            error = repr(e)
+        self._db.execute(
+            "INSERT OR REPLACE INTO files (path, size, mtime_ns, sha256, status, error) VALUES (?, ?, ?, ?, ?, ?)",
+            (path, st.st_size, st.st_mtime_ns, sha256, INGEST_STATUS_OK if error is None else INGEST_STATUS_ERROR, error)
+        )
+        return XLDIngestEvent(kind=INGEST_EVENT_ADDED if row is None else INGEST_EVENT_CHANGED, path=path, log=log, error=error)
+
+    def _record_error(self, path: str, row: tuple[int, int, str, str | None] | None, error: str):
+        # e.g. permission denied or a symlink loop. The placeholder size and mtime make every scan
+        # retry the file, but an unchanged error is neither rewritten nor emitted again.
+        if row is not None and row[3] == error:
+            return None
+        self._db.execute(
+            "INSERT OR REPLACE INTO files (path, size, mtime_ns, sha256, status, error) VALUES (?, -1, -1, '', ?, ?)",
+            (path, INGEST_STATUS_ERROR, error)
+        )
+        return XLDIngestEvent(kind=INGEST_EVENT_ADDED if row is None else INGEST_EVENT_CHANGED, path=path, log=None, error=error)
+
+    def scan(self, roots: Iterable[str]) -> Iterator[XLDIngestEvent]:
+        # if the consumer raises, breaks out or close()s the generator, rows written since the last
+        # checkpoint are rolled back, so their events are emitted again by the next scan
+        try:
+            yield from self._scan(roots)
+        except BaseException:
+            self._db.rollback()
+            raise
+
+    def _scan(self, roots: Iterable[str]) -> Iterator[XLDIngestEvent]:
+        # unchanged files are only stat()ed, never rewritten. Files processed before the last
+        # checkpoint of an interrupted run already carry their new size and mtime, so a resumed
+        # run skips them the same way.
+        roots = [os.path.join(os.path.abspath(root), "") for root in roots]
+        self._db.execute("DELETE FROM seen")
+        pending = 0
+        for path in self._walk(roots):
+            # a file vanishing mid-scan is still counted as seen and reported removed by the next scan
+            self._db.execute("INSERT OR IGNORE INTO seen (path) VALUES (?)", (path,))
+            row = self._db.execute("SELECT size, mtime_ns, sha256, error FROM files WHERE path = ?", (path,)).fetchone()
+            try:
+                st = os.stat(path)
+                if row is not None and row[0] == st.st_size and row[1] == st.st_mtime_ns:
+                    continue
+                with open(path, "rb") as f:
+                    data = f.read()
+            except FileNotFoundError:
+                continue
+            except OSError as e:
+                event = self._record_error(path, row, repr(e))
+            else:
+                event = self._record(path, row, st, data)
+            if event is not None:
+                # emitted before the checkpoint covering it, so an interrupted run re-emits rather than drops it
+                yield event
+            pending += 1
+            if pending >= self.checkpoint_interval:
+                self._db.commit()
+                pending = 0
+
+        for root in roots:
+            # every path under root sorts in [root, upper); a range lets SQLite seek the primary key index
+            upper = root[:-1] + chr(ord(root[-1]) + 1)
+            removed = self._db.execute(
+                "SELECT path FROM files WHERE path >= ? AND path < ? AND path NOT IN (SELECT path FROM seen)",
+                (root, upper)
+            ).fetchall()
+            for (path,) in removed:
+                self._db.execute("DELETE FROM files WHERE path = ?", (path,))
+                yield XLDIngestEvent(kind=INGEST_EVENT_REMOVED, path=path, log=None, error=None)
+        self._db.execute("DELETE FROM seen")
+        self._db.commit()
+
+    def watch(self, roots: Iterable[str], interval: float = 60) -> Iterator[XLDIngestEvent]:
+        roots = list(roots)
+        try:
+            while True:
+                # an abort while suspended inside scan() is rolled back there
+                yield from self.scan(roots)
+                time.sleep(interval)
+        except BaseException:
+            self._db.rollback()
+            raise
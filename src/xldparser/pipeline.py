@@ -0,0 +1,143 @@
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Executor, Future
+from dataclasses import dataclass
+from io import BytesIO, TextIOWrapper
+from typing import Iterable, Iterator
+from . import XLDLog, XLDLogFilter
+from .bulk import XLDParseResult
+
+@dataclass
+class XLDReadAheadStats:
+    files: int = 0
+    bytes: int = 0
+    max_queue_depth: int = 0
+    queue_depth_total: int = 0
+    # time I/O threads spent waiting for room in the queue, i.e. parsing was the bottleneck
+    io_stall_seconds: float = 0
+    # time the consumer spent waiting for a ready buffer, i.e. I/O was the bottleneck
+    parse_stall_seconds: float = 0
+
+    def mean_queue_depth(self):
+        if self.files == 0:
+            return None
+        return self.queue_depth_total / self.files
+
+
+def _parse_buffer(path: str, data: bytes | None, error: str | None, log_filter: XLDLogFilter | None):
+    if data is None:
+        return XLDParseResult(path=path, log=None, error=error)
+    try:
+        input = TextIOWrapper(BytesIO(data), encoding="utf-8")
+        if log_filter is not None:
+            return XLDParseResult(path=path, log=XLDLog.parse_filtered(input, log_filter), error=None)
+        return XLDParseResult(path=path, log=XLDLog.parse(input), error=None)
+    except Exception as e:
+        return XLDParseResult(path=path, log=None, error=repr(e))
+
+
+_DONE = object()
+
+class XLDReadAhead:
+    def __init__(self, io_workers: int = 4, queue_size: int = 64, read_size: int = 1 << 20):
+        self.io_workers = io_workers
+        self.queue_size = queue_size
+        self.read_size = read_size
+        self.stats = XLDReadAheadStats()
+        self._stats_lock = threading.Lock()
+
+    def _read_file(self, path: str):
+        chunks: list[bytes] = []
+        with open(path, "rb", buffering=0) as f:
+            while True:
+                chunk = f.read(self.read_size)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+        return b"".join(chunks)
+
+    def read(self, paths: Iterable[str]) -> Iterator[tuple[str, bytes | None, str | None]]:
+        # yields (path, data, error) in completion order, not in the order of paths
+        self.stats = XLDReadAheadStats()
+        ready: queue.Queue[object] = queue.Queue(maxsize=self.queue_size)
+        paths_iter = iter(paths)
+        paths_lock = threading.Lock()
+        stop = threading.Event()
+
+        def put(item: object):
+            start = time.perf_counter()
+            while not stop.is_set():
+                try:
+                    ready.put(item, timeout=0.1)
+                    break
+                except queue.Full:
+                    continue
+            with self._stats_lock:
+                self.stats.io_stall_seconds += time.perf_counter() - start
+
+        def worker():
+            try:
+                while not stop.is_set():
+                    with paths_lock:
+                        path = next(paths_iter, None)
+                    if path is None:
+                        break
+                    try:
+                        item = (path, self._read_file(path), None)
+                    except OSError as e:
+                        item = (path, None, repr(e))
+                    put(item)
+            except BaseException as e:
+                # anything else (e.g. raised by the paths iterable) is re-raised by the consumer
+                put(e)
+            finally:
+                put(_DONE)
+
+        threads = [threading.Thread(target=worker, daemon=True) for _ in range(self.io_workers)]
+        for thread in threads:
+            thread.start()
+        finished = 0
+        try:
+            while finished < len(threads):
+                start = time.perf_counter()
+                item = ready.get()
+                self.stats.parse_stall_seconds += time.perf_counter() - start
+                if item is _DONE:
+                    finished += 1
+                    continue
+                if isinstance(item, BaseException):
+                    raise item
+                assert isinstance(item, tuple)
+                path, data, error = item
+                depth = ready.qsize()
+                self.stats.files += 1
+                self.stats.bytes += len(data) if data is not None else 0
+                self.stats.queue_depth_total += depth
+                self.stats.max_queue_depth = max(self.stats.max_queue_depth, depth)
+                yield path, data, error
+        finally:
+            stop.set()
+            for thread in threads:
+                thread.join()
+
+    def parse(self, paths: Iterable[str], executor: Executor | None = None, log_filter: XLDLogFilter | None = None) -> Iterator[XLDParseResult]:
+        # without an executor, buffers are parsed on the calling thread; rejected logs are left out
+        if executor is None:
+            results: Iterator[XLDParseResult] = (_parse_buffer(path, data, error, log_filter) for path, data, error in self.read(paths))
+        else:
+            results = self._parse_on(executor, paths, log_filter)
+        for result in results:
+            if result.log is not None or result.error is not None:
+                yield result
+
+    def _parse_on(self, executor: Executor, paths: Iterable[str], log_filter: XLDLogFilter | None):
+        # at most queue_size buffers are handed to the executor at once, so memory stays bounded
+        in_flight: deque[Future[XLDParseResult]] = deque()
+        for path, data, error in self.read(paths):
+            in_flight.append(executor.submit(_parse_buffer, path, data, error, log_filter))
+            if len(in_flight) >= self.queue_size:
+                yield in_flight.popleft().result()
+        while in_flight:
+            yield in_flight.popleft().result()
@@ -0,0 +1,215 @@
+from dataclasses import dataclass, field
+from . import XLDLog
+from .track import XLDTrackEntry
+
+# bucket 0 holds 0, bucket i holds [2 ** (i - 1), 2 ** i), the last bucket is open-ended
+HISTOGRAM_BUCKETS = 32
+
+@dataclass
+class XLDHistogram:
+    buckets: list[int] = field(default_factory=lambda: [0] * HISTOGRAM_BUCKETS)
+    count: int = 0
+    total: int = 0
+    min: int | None = None
+    max: int | None = None
+
+    @staticmethod
+    def bucket_of(value: int):
+        assert value >= 0
+        return min(value.bit_length(), HISTOGRAM_BUCKETS - 1)
+
+    @staticmethod
+    def bucket_range(i: int):
+        if i == 0:
+            return 0, 0
+        return 2 ** (i - 1), 2 ** i - 1
+
+    def add(self, value: int):
+        self.buckets[XLDHistogram.bucket_of(value)] += 1
+        self.count += 1
+        self.total += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def merge(self, other: "XLDHistogram"):
+        for i, n in enumerate(other.buckets):
+            self.buckets[i] += n
+        self.count += other.count
+        self.total += other.total
+        if other.min is not None and (self.min is None or other.min < self.min):
+            self.min = other.min
+        if other.max is not None and (self.max is None or other.max > self.max):
+            self.max = other.max
+
+    def mean(self):
+        if self.count == 0:
+            return None
+        return self.total / self.count
+
+    def _bucket_ends(self, i: int):
+        # estimated values of the first and last entry in bucket i, clamped to the observed min/max
+        assert self.min is not None and self.max is not None
+        lo, hi = XLDHistogram.bucket_range(i)
+        if i == HISTOGRAM_BUCKETS - 1:
+            # the last bucket is open-ended
+            hi = self.max
+        lo = max(lo, self.min)
+        hi = min(hi, self.max)
+        if self.buckets[i] == 1:
+            # the only entry of the lowest (highest) occupied bucket is exactly min (max)
+            if lo == self.min:
+                return lo, lo
+            if hi == self.max:
+                return hi, hi
+            return (lo + hi) / 2, (lo + hi) / 2
+        return lo, hi
+
+    def quantile(self, q: float):
+        # entries are assumed to be spread evenly over their bucket, and ranks falling
+        # between two occupied buckets are interpolated across the gap
+        assert 0 <= q <= 1
+        if self.count == 0:
+            return None
+        assert self.min is not None and self.max is not None
+        if q == 0:
+            return float(self.min)
+        if q == 1:
+            return float(self.max)
+        rank = q * (self.count - 1)
+        seen = 0
+        occupied = [i for i, n in enumerate(self.buckets) if n > 0]
+        for j, i in enumerate(occupied):
+            n = self.buckets[i]
+            first, last = self._bucket_ends(i)
+            if rank <= seen + n - 1:
+                if n == 1:
+                    return float(first)
+                return first + (last - first) * ((rank - seen) / (n - 1))
+            if rank < seen + n:
+                next_first, _ = self._bucket_ends(occupied[j + 1])
+                return last + (next_first - last) * (rank - (seen + n - 1))
+            seen += n
+        return float(self.max)
+
+
+def _merge_counter(dest: dict[int, int], src: dict[int, int]):
+    for k, v in src.items():
+        dest[k] = dest.get(k, 0) + v
+
+
+@dataclass
+class XLDGroupStatistics:
+    logs: int = 0
+    cancelled_logs: int = 0
+    disc_not_found_logs: int = 0
+    read_offset_corrections: dict[int, int] = field(default_factory=dict)
+    alternate_offset_corrections: dict[int, int] = field(default_factory=dict)
+
+    tracks: int = 0
+    read_error: XLDHistogram = field(default_factory=XLDHistogram)
+    jitter_error: XLDHistogram = field(default_factory=XLDHistogram)
+    retry_sector_count: XLDHistogram = field(default_factory=XLDHistogram)
+    damaged_sector_count: XLDHistogram = field(default_factory=XLDHistogram)
+
+    accuraterip_ok: int = 0
+    accuraterip_ng: int = 0
+    accuraterip_not_found: int = 0
+    accuraterip_with_different_offset: int = 0
+    accuraterip_confidence: XLDHistogram = field(default_factory=XLDHistogram)
+
+    def add(self, log: XLDLog):
+        self.logs += 1
+        if log.is_cancelled:
+            self.cancelled_logs += 1
+        if log.accuraterip_disc_id is None:
+            self.disc_not_found_logs += 1
+        self.read_offset_corrections[log.read_offset_correction] = self.read_offset_corrections.get(log.read_offset_correction, 0) + 1
+        for alternate_offset_correction in log.alternate_offset_corrections:
+            self.alternate_offset_corrections[alternate_offset_correction.absolute] = self.alternate_offset_corrections.get(alternate_offset_correction.absolute, 0) + 1
+        for track in log.tracks:
+            if not isinstance(track, XLDTrackEntry):
+                continue
+            self.tracks += 1
+            self.read_error.add(track.statistics.read_error)
+            self.jitter_error.add(track.statistics.jitter_error)
+            self.retry_sector_count.add(track.statistics.retry_sector_count)
+            self.damaged_sector_count.add(track.statistics.damaged_sector_count)
+            if track.accuraterip_result is None:
+                self.accuraterip_not_found += 1
+            elif track.accuraterip_result.success_summary is None:
+                self.accuraterip_ng += 1
+            else:
+                self.accuraterip_ok += 1
+                success_summary = track.accuraterip_result.success_summary
+                if success_summary.offset != 0:
+                    self.accuraterip_with_different_offset += 1
+                self.accuraterip_confidence.add(success_summary.confidence_used_v1 + success_summary.confidence_used_v2)
+
+    def merge(self, other: "XLDGroupStatistics"):
+        self.logs += other.logs
+        self.cancelled_logs += other.cancelled_logs
+        self.disc_not_found_logs += other.disc_not_found_logs
+        _merge_counter(self.read_offset_corrections, other.read_offset_corrections)
+        _merge_counter(self.alternate_offset_corrections, other.alternate_offset_corrections)
+        self.tracks += other.tracks
+        self.read_error.merge(other.read_error)
+        self.jitter_error.merge(other.jitter_error)
+        self.retry_sector_count.merge(other.retry_sector_count)
+        self.damaged_sector_count.merge(other.damaged_sector_count)
+        self.accuraterip_ok += other.accuraterip_ok
+        self.accuraterip_ng += other.accuraterip_ng
+        self.accuraterip_not_found += other.accuraterip_not_found
+        self.accuraterip_with_different_offset += other.accuraterip_with_different_offset
+        self.accuraterip_confidence.merge(other.accuraterip_confidence)
+
+    def cancellation_rate(self):
+        if self.logs == 0:
+            return None
+        return self.cancelled_logs / self.logs
+
+    def accuraterip_hit_rate(self):
+        looked_up = self.accuraterip_ok + self.accuraterip_ng
+        if looked_up == 0:
+            return None
+        return self.accuraterip_ok / looked_up
+
+
+@dataclass
+class XLDCorpusStatistics:
+    # keyed by (used_drive, xld_version)
+    groups: dict[tuple[str, str], XLDGroupStatistics] = field(default_factory=dict)
+
+    def add(self, log: XLDLog):
+        key = (log.used_drive, log.xld_version)
+        group = self.groups.get(key)
+        if group is None:
+            group = XLDGroupStatistics()
+            self.groups[key] = group
+        group.add(log)
+
+    def merge(self, other: "XLDCorpusStatistics"):
+        for key, other_group in other.groups.items():
+            group = self.groups.get(key)
+            if group is None:
+                group = XLDGroupStatistics()
+                self.groups[key] = group
+            group.merge(other_group)
+        return self
+
+    def by_drive(self):
+        result: dict[str, XLDGroupStatistics] = {}
+        for (used_drive, _), group in self.groups.items():
+            if used_drive not in result:
+                result[used_drive] = XLDGroupStatistics()
+            result[used_drive].merge(group)
+        return result
+
+    def by_xld_version(self):
+        result: dict[str, XLDGroupStatistics] = {}
+        for (_, xld_version), group in self.groups.items():
+            if xld_version not in result:
+                result[xld_version] = XLDGroupStatistics()
+            result[xld_version].merge(group)
+        return result
@@ -171,7 +171,6 @@ class XLDTrackEntry:
             assert line.readline().rstrip() == c.XLD_TRACK_CRC32_HASH_TEST_FAIL
         crc32_skip_zero_hash = line.readline().rstrip()
         assert crc32_skip_zero_hash.startswith(c.XLD_TRACK_CRC32_SKIP_ZERO_HASH_HEADER)
-        print(crc32_skip_zero_hash)
         crc32_skip_zero_hash = crc32_skip_zero_hash[len(c.XLD_TRACK_CRC32_SKIP_ZERO_HASH_HEADER):]
 
         accuraterip_v1 = line.readline().rstrip()
@@ -0,0 +1,181 @@
+import os
+import shutil
+import subprocess
+import wave
+import zlib
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Iterable, Iterator
+import numpy as np
+from . import XLDLog
+from .bulk import BULK_WINDOW_PER_WORKER
+from .track import XLDTrackEntry
+
+SAMPLES_PER_FRAME = 588
+ACCURATERIP_SKIP_SAMPLES = 5 * SAMPLES_PER_FRAME
+# checksums are computed over blocks of this many stereo samples to bound the uint64 temporaries
+VERIFY_BLOCK_SAMPLES = 1 << 20
+
+@dataclass
+class XLDTrackVerification:
+    no: int
+    path: str
+    crc32_hash: str
+    crc32_skip_zero_hash: str
+    accuraterip_v1: str
+    accuraterip_v2: str
+    crc32_ok: bool
+    crc32_skip_zero_ok: bool
+    accuraterip_v1_ok: bool
+    accuraterip_v2_ok: bool
+    # offset (in samples) whose checksums matched the "w/correction" signatures, if any
+    matched_offset: int | None
+
+@dataclass
+class XLDLogVerification:
+    audio_dir: str
+    tracks: list[XLDTrackVerification]
+    error: str | None
+
+
+def read_pcm(path: str):
+    if path.lower().endswith(".flac"):
+        flac = shutil.which("flac")
+        if flac is None:
+            raise Exception("flac decoder is not available: " + path)
+        data = subprocess.run(
+            [flac, "-d", "-c", "-s", "--force-raw-format", "--endian=little", "--sign=signed", path],
+            check=True, stdout=subprocess.PIPE
+        ).stdout
+    else:
+        with wave.open(path, "rb") as w:
+            if w.getnchannels() != 2 or w.getsampwidth() != 2:
+                raise Exception("Not a 16-bit stereo file: " + path)
+            data = w.readframes(w.getnframes())
+    assert len(data) % 4 == 0
+    # one little-endian uint32 per stereo sample, left channel in the low half
+    return np.frombuffer(data, dtype="<u4")
+
+
+def crc32(samples: np.ndarray):
+    return "%08X" % (zlib.crc32(samples.tobytes()),)
+
+
+def crc32_skip_zero(samples: np.ndarray):
+    words = samples.view("<u2")
+    return "%08X" % (zlib.crc32(words[words != 0].tobytes()),)
+
+
+def accuraterip(samples: np.ndarray, is_first_track: bool, is_last_track: bool):
+    # positions are 1-based; the first and last tracks skip 5 frames at the disc edges
+    check_from = ACCURATERIP_SKIP_SAMPLES - 1 if is_first_track else 1
+    check_to = len(samples) - ACCURATERIP_SKIP_SAMPLES if is_last_track else len(samples)
+    v1 = 0
+    v2 = 0
+    for start in range(check_from, check_to + 1, VERIFY_BLOCK_SAMPLES):
+        end = min(start + VERIFY_BLOCK_SAMPLES, check_to + 1)
+        product = samples[start - 1:end - 1].astype(np.uint64) * np.arange(start, end, dtype=np.uint64)
+        v1 += int(product.sum(dtype=np.uint64))
+        v2 += int((product & 0xFFFFFFFF).sum(dtype=np.uint64)) + int((product >> 32).sum(dtype=np.uint64))
+    return "%08X" % (v1 & 0xFFFFFFFF,), "%08X" % (v2 & 0xFFFFFFFF,)
+
+
+def _shifted(prev: np.ndarray | None, cur: np.ndarray, next: np.ndarray | None, offset: int):
+    # the track as it would read with the given sample offset, borrowing samples from the neighbouring tracks
+    zeros = np.zeros(abs(offset), dtype=np.uint32)
+    if offset > 0:
+        tail = next[:offset] if next is not None else zeros
+        if len(tail) < offset:
+            tail = np.concatenate([tail, zeros[len(tail):]])
+        return np.concatenate([cur[offset:], tail])
+    elif offset < 0:
+        head = prev[offset:] if prev is not None else zeros
+        if len(head) < -offset:
+            head = np.concatenate([zeros[len(head):], head])
+        return np.concatenate([head, cur[:offset]])
+    return cur
+
+
+def verify_log(log: XLDLog, audio_dir: str, search_offsets: bool = False):
+    entries = [t for t in log.tracks if isinstance(t, XLDTrackEntry)]
+    first_no = log.toc[0].no
+    last_no = log.toc[-1].no
+    paths = [os.path.join(audio_dir, os.path.basename(t.filename)) for t in entries]
+    loaded: dict[int, np.ndarray] = {}
+
+    def load(i: int):
+        if i < 0 or i >= len(entries):
+            return None
+        if i not in loaded:
+            loaded[i] = read_pcm(paths[i])
+        return loaded[i]
+
+    results: list[XLDTrackVerification] = []
+    for i, track in enumerate(entries):
+        for k in [k for k in loaded if k < i - 1]:
+            del loaded[k]
+        samples = load(i)
+        assert samples is not None
+        is_first = track.no == first_no
+        is_last = track.no == last_no
+        v1, v2 = accuraterip(samples, is_first, is_last)
+        crc = crc32(samples)
+        crc_skip_zero = crc32_skip_zero(samples)
+
+        offsets: list[int] = []
+        if track.accuraterip_v1_with_correction is not None or track.accuraterip_v2_with_correction is not None:
+            if track.accuraterip_result is not None and track.accuraterip_result.success_summary is not None and track.accuraterip_result.success_summary.offset != 0:
+                offsets.append(track.accuraterip_result.success_summary.offset)
+            if search_offsets:
+                offsets.extend(x.relative for x in log.alternate_offset_corrections if x.relative != 0 and x.relative not in offsets)
+        matched_offset = None
+        for offset in offsets:
+            prev = load(i - 1) if i > 0 and entries[i - 1].no == track.no - 1 else None
+            next = load(i + 1) if i + 1 < len(entries) and entries[i + 1].no == track.no + 1 else None
+            shifted_v1, shifted_v2 = accuraterip(_shifted(prev, samples, next, offset), is_first, is_last)
+            if shifted_v1 == track.accuraterip_v1_with_correction or shifted_v2 == track.accuraterip_v2_with_correction:
+                matched_offset = offset
+                break
+
+        results.append(XLDTrackVerification(
+            no=track.no,
+            path=paths[i],
+            crc32_hash=crc,
+            crc32_skip_zero_hash=crc_skip_zero,
+            accuraterip_v1=v1,
+            accuraterip_v2=v2,
+            crc32_ok=crc == track.crc32_hash,
+            crc32_skip_zero_ok=crc_skip_zero == track.crc32_skip_zero_hash,
+            accuraterip_v1_ok=v1 == track.accuraterip_v1,
+            accuraterip_v2_ok=v2 == track.accuraterip_v2,
+            matched_offset=matched_offset
+        ))
+    return results
+
+
+def _verify_job(job: tuple[XLDLog, str, bool]):
+    log, audio_dir, search_offsets = job
+    try:
+        return XLDLogVerification(audio_dir=audio_dir, tracks=verify_log(log, audio_dir, search_offsets), error=None)
+    except Exception as e:
+        return XLDLogVerification(audio_dir=audio_dir, tracks=[], error=repr(e))
+
+
+def verify_logs(jobs: Iterable[tuple[XLDLog, str]], search_offsets: bool = False, max_workers: int | None = None) -> Iterator[XLDLogVerification]:
+    # one log (disc) per task, since offset search needs the neighbouring tracks of the same disc.
+    # Results come back in input order, with at most a window of logs pickled and in flight.
+    window = BULK_WINDOW_PER_WORKER * (max_workers or os.cpu_count() or 1)
+    jobs_iter = iter(jobs)
+    in_flight: deque[Future[XLDLogVerification]] = deque()
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        while True:
+            while len(in_flight) < window:
+                job = next(jobs_iter, None)
+                if job is None:
+                    break
+                log, audio_dir = job
+                in_flight.append(pool.submit(_verify_job, (log, audio_dir, search_offsets)))
+            if len(in_flight) == 0:
+                break
+            yield in_flight.popleft().result()